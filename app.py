@@ -6,18 +6,31 @@ A clean, modern single-page interface for:
 2. Getting optimal lineup recommendations
 """
 
+from pathlib import Path
+
+import numpy as np
 import streamlit as st
-import pandas as pd
 
 from optimizer import (
     get_teams,
     get_optimal_lineup,
+    get_team_players,
     load_player_values,
     calculate_offensive_weight,
     calculate_fatigue_penalty,
+    MAX_GOAL_DIFF,
 )
 
 
+STATIC_DIR = Path(__file__).parent / "static"
+
+
+@st.cache_resource
+def load_css() -> str:
+    """Read the app stylesheet once per process."""
+    return (STATIC_DIR / "style.css").read_text()
+
+
 # Page configuration
 st.set_page_config(
     page_title="WCR Lineup Optimizer",
@@ -28,264 +41,7 @@ st.set_page_config(
 
 
 # Modern CSS styling to match React component
-st.markdown("""
-<style>
-    /* Hide default Streamlit elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Main container */
-    .main .block-container {
-        padding: 0;
-        max-width: 100%;
-    }
-    
-    /* Score header */
-    .score-header {
-        background: linear-gradient(135deg, #1e293b 0%, #334155 100%);
-        padding: 1.5rem 2rem;
-        display: flex;
-        justify-content: center;
-        align-items: center;
-        gap: 3rem;
-        margin-bottom: 2rem;
-    }
-    
-    .team-score {
-        text-align: center;
-        color: white;
-    }
-    
-    .team-label {
-        font-size: 0.75rem;
-        text-transform: uppercase;
-        letter-spacing: 0.1em;
-        opacity: 0.7;
-        margin-bottom: 0.25rem;
-    }
-    
-    .score-value {
-        font-size: 3rem;
-        font-weight: 700;
-        line-height: 1;
-    }
-    
-    .team-name {
-        font-size: 0.9rem;
-        margin-top: 0.25rem;
-        opacity: 0.9;
-    }
-    
-    .diff-display {
-        text-align: center;
-        color: white;
-    }
-    
-    .diff-label {
-        font-size: 0.65rem;
-        text-transform: uppercase;
-        opacity: 0.5;
-    }
-    
-    .diff-value {
-        font-size: 1.25rem;
-        opacity: 0.7;
-    }
-    
-    /* Section header */
-    .section-header {
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-        margin-bottom: 1rem;
-    }
-    
-    .section-indicator {
-        width: 4px;
-        height: 24px;
-        border-radius: 2px;
-    }
-    
-    .indicator-yellow {
-        background-color: #eab308;
-    }
-    
-    .indicator-rose {
-        background-color: #f43f5e;
-    }
-    
-    .section-title {
-        font-size: 1.125rem;
-        font-weight: 600;
-        color: #111827;
-    }
-    
-    /* Card styling */
-    .card {
-        background: white;
-        border: 1px solid #e5e7eb;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-    }
-    
-    .card-header {
-        padding: 0.75rem 1rem;
-        border-bottom: 1px solid #e5e7eb;
-        font-weight: 500;
-        color: #111827;
-    }
-    
-    .card-body {
-        padding: 1rem;
-    }
-    
-    /* Strategy badge */
-    .strategy-container {
-        background: #ecfdf5;
-        border: 1px solid #a7f3d0;
-        border-radius: 0.5rem;
-        padding: 0.75rem 1rem;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    
-    .strategy-badge {
-        display: inline-block;
-        background: #10b981;
-        color: white;
-        font-size: 0.75rem;
-        font-weight: 600;
-        padding: 0.25rem 0.75rem;
-        border-radius: 9999px;
-        margin-bottom: 0.5rem;
-    }
-    
-    .strategy-weights {
-        font-size: 0.75rem;
-        color: #4b5563;
-    }
-    
-    /* Player card */
-    .player-card {
-        display: flex;
-        align-items: center;
-        gap: 0.75rem;
-        padding: 0.75rem;
-        background: #f9fafb;
-        border: 1px solid #f3f4f6;
-        border-radius: 0.5rem;
-        margin-bottom: 0.5rem;
-    }
-    
-    .player-number {
-        width: 2rem;
-        height: 2rem;
-        background: #2563eb;
-        color: white;
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-weight: 600;
-        font-size: 0.875rem;
-    }
-    
-    .player-info {
-        flex: 1;
-    }
-    
-    .player-name {
-        font-weight: 500;
-        color: #111827;
-    }
-    
-    .player-stats {
-        font-size: 0.75rem;
-        color: #6b7280;
-        margin-top: 0.125rem;
-    }
-    
-    /* Stats row */
-    .stats-row {
-        display: grid;
-        grid-template-columns: repeat(3, 1fr);
-        gap: 1rem;
-        padding: 0.75rem 1rem;
-        background: #f9fafb;
-        border-top: 1px solid #e5e7eb;
-        text-align: center;
-    }
-    
-    .stat-label {
-        font-size: 0.75rem;
-        color: #6b7280;
-        margin-bottom: 0.125rem;
-    }
-    
-    .stat-value {
-        font-weight: 600;
-        color: #111827;
-    }
-    
-    .stat-value.blue {
-        color: #2563eb;
-    }
-    
-    .stat-value.green {
-        color: #10b981;
-    }
-    
-    /* Metrics */
-    .metrics-row {
-        display: grid;
-        grid-template-columns: repeat(3, 1fr);
-        gap: 1rem;
-        margin-top: 1rem;
-    }
-    
-    .metric-card {
-        background: white;
-        border: 1px solid #e5e7eb;
-        border-radius: 0.5rem;
-        padding: 1rem;
-    }
-    
-    .metric-label {
-        font-size: 0.75rem;
-        color: #6b7280;
-        margin-bottom: 0.25rem;
-    }
-    
-    .metric-value {
-        font-size: 1.5rem;
-        font-weight: 600;
-        color: #111827;
-    }
-    
-    /* Empty state */
-    .empty-state {
-        text-align: center;
-        padding: 2rem;
-        color: #9ca3af;
-    }
-    
-    /* Button override */
-    .stButton > button {
-        border-radius: 0.5rem;
-    }
-    
-    /* Expander styling */
-    .streamlit-expanderHeader {
-        font-weight: 500;
-    }
-    
-    /* Content area padding */
-    .content-area {
-        padding: 0 2rem 2rem 2rem;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>\n{load_css()}</style>", unsafe_allow_html=True)
 
 
 def init_session_state():
@@ -295,6 +51,9 @@ def init_session_state():
         'away_team': None,
         'stints': [],
         'player_minutes': {},
+        'home_total': 0,  # Running totals, updated in add_stint
+        'away_total': 0,
+        'total_time': 0.0,
         'game_started': False,
         'optimal_result': None,
         'selected_players': [],  # Persist selected players across reruns
@@ -305,10 +64,26 @@ def init_session_state():
             st.session_state[key] = value
 
 
-def get_team_players(team: str) -> pd.DataFrame:
-    """Get all players for a team with their ratings."""
-    player_values = load_player_values()
-    return player_values[player_values['team'] == team].copy()
+@st.cache_resource
+def get_mobility_map(team: str) -> dict[str, float]:
+    """Map each of a team's players to their mobility rating (shared, do not modify)."""
+    team_players = get_team_players(team)
+    return dict(zip(team_players['player'], team_players['mobility_rating']))
+
+
+@st.cache_data(max_entries=64)
+def get_cached_optimal_lineup(team: str, goal_diff: int, minutes_key: tuple) -> tuple:
+    """
+    Cached get_optimal_lineup.
+    
+    minutes_key is the sorted (player, minutes) pairs of the player minutes
+    dict, so repeat clicks with an unchanged game state skip the optimizer.
+    """
+    return get_optimal_lineup(
+        team=team,
+        goal_diff=goal_diff,
+        player_minutes=dict(minutes_key) if minutes_key else None
+    )
 
 
 def format_player_name(player: str) -> str:
@@ -329,11 +104,15 @@ def format_player_name(player: str) -> str:
     return player
 
 
+@st.cache_resource
+def get_display_names() -> dict[str, str]:
+    """Map every player id to its display name (built once per process)."""
+    return {p: format_player_name(p) for p in load_player_values()['player']}
+
+
 def get_total_score() -> tuple[int, int]:
-    """Calculate total score from all stints."""
-    home = sum(s['home_goals'] for s in st.session_state.stints)
-    away = sum(s['away_goals'] for s in st.session_state.stints)
-    return home, away
+    """Get total score from all stints."""
+    return st.session_state.home_total, st.session_state.away_total
 
 
 def get_goal_diff() -> int:
@@ -353,6 +132,11 @@ def add_stint(lineup: list, home_goals: int, away_goals: int, duration: float):
     }
     st.session_state.stints.append(stint)
     
+    # Update running totals
+    st.session_state.home_total += home_goals
+    st.session_state.away_total += away_goals
+    st.session_state.total_time += duration
+    
     # Update player minutes
     for player in lineup:
         st.session_state.player_minutes[player] = (
@@ -364,6 +148,9 @@ def reset_game():
     """Reset all game state."""
     st.session_state.stints = []
     st.session_state.player_minutes = {}
+    st.session_state.home_total = 0
+    st.session_state.away_total = 0
+    st.session_state.total_time = 0.0
     st.session_state.game_started = False
     st.session_state.optimal_result = None
     st.session_state.selected_players = []
@@ -398,6 +185,7 @@ def main():
     init_session_state()
     
     teams = get_teams()
+    display_name = get_display_names().__getitem__
     
     # Team selection screen
     if not st.session_state.game_started:
@@ -452,16 +240,14 @@ def main():
         
         # Add New Stint
         with st.expander("➕ Add New Stint", expanded=len(st.session_state.stints) == 0):
-            team_players = get_team_players(home_team)
+            mobility_map = get_mobility_map(home_team)
             
             # Get current selection from session state
             current_selection = st.session_state.selected_players
             
             # Calculate current mobility of selected players
             current_mobility = sum(
-                team_players[team_players['player'] == p]['mobility_rating'].values[0]
-                for p in current_selection
-                if p in team_players['player'].values
+                mobility_map[p] for p in current_selection if p in mobility_map
             )
             
             # Filter available players: only show those that fit within remaining mobility budget
@@ -469,9 +255,7 @@ def main():
             
             # Build list of available players (already selected + those that fit)
             available_players = []
-            for _, row in team_players.iterrows():
-                player = row['player']
-                mobility = row['mobility_rating']
+            for player, mobility in mobility_map.items():
                 # Include if already selected OR if they fit in remaining budget
                 if player in current_selection or mobility <= remaining_budget:
                     available_players.append(player)
@@ -481,7 +265,7 @@ def main():
                 available_players,
                 default=[p for p in current_selection if p in available_players],
                 max_selections=4,
-                format_func=format_player_name,
+                format_func=display_name,
                 key="player_select"
             )
             
@@ -489,10 +273,7 @@ def main():
             st.session_state.selected_players = selected_players
             
             if selected_players:
-                total_mobility = sum(
-                    team_players[team_players['player'] == p]['mobility_rating'].values[0]
-                    for p in selected_players
-                )
+                total_mobility = sum(mobility_map[p] for p in selected_players)
                 mobility_color = "#10b981" if total_mobility <= 8.0 else "#ef4444"
                 st.markdown(f"Total Classification: <span style='color: {mobility_color}; font-weight: 600;'>{total_mobility:.1f} / 8.0</span>", unsafe_allow_html=True)
             else:
@@ -517,19 +298,21 @@ def main():
         # Recorded Stints
         with st.expander("📋 Recorded Stints", expanded=len(st.session_state.stints) > 0):
             if st.session_state.stints:
+                stint_html = []
                 for s in st.session_state.stints:
-                    lineup_display = ", ".join([format_player_name(p) for p in sorted(s['lineup'])])
-                    st.markdown(f"""
-                    <div style="padding: 0.5rem; background: #f9fafb; border-radius: 0.375rem; margin-bottom: 0.5rem; font-size: 0.875rem;">
-                        <strong>Stint {s['stint_num']}</strong>: {lineup_display}<br>
-                        <span style="color: #6b7280;">Score: {s['home_goals']}-{s['away_goals']} | {s['duration']} min</span>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    lineup_display = ", ".join([display_name(p) for p in sorted(s['lineup'])])
+                    stint_html.append(
+                        '<div style="padding: 0.5rem; background: #f9fafb; border-radius: 0.375rem; margin-bottom: 0.5rem; font-size: 0.875rem;">'
+                        f"<strong>Stint {s['stint_num']}</strong>: {lineup_display}<br>"
+                        f"<span style=\"color: #6b7280;\">Score: {s['home_goals']}-{s['away_goals']} | {s['duration']} min</span>"
+                        '</div>'
+                    )
+                st.markdown("".join(stint_html), unsafe_allow_html=True)
             else:
                 st.markdown('<div class="empty-state">No stints recorded yet</div>', unsafe_allow_html=True)
         
         # Metrics
-        total_time = sum(s['duration'] for s in st.session_state.stints)
+        total_time = st.session_state.total_time
         st.markdown(f"""
         <div class="metrics-row">
             <div class="metric-card">
@@ -550,9 +333,13 @@ def main():
         # Player Minutes
         with st.expander("⏱️ Player Minutes"):
             if st.session_state.player_minutes:
-                for p, m in sorted(st.session_state.player_minutes.items(), key=lambda x: -x[1]):
-                    penalty = (1 - calculate_fatigue_penalty(m)) * 100
-                    st.markdown(f"**{format_player_name(p)}**: {m:.1f} min (-{penalty:.0f}% fatigue)")
+                minutes_played = sorted(st.session_state.player_minutes.items(), key=lambda x: -x[1])
+                minutes_arr = np.fromiter((m for _, m in minutes_played), dtype=np.float64, count=len(minutes_played))
+                penalties = (1 - calculate_fatigue_penalty(minutes_arr)) * 100
+                st.markdown("\n\n".join(
+                    f"**{display_name(p)}**: {m:.1f} min (-{penalty:.0f}% fatigue)"
+                    for (p, m), penalty in zip(minutes_played, penalties)
+                ))
             else:
                 st.markdown("No players have played yet.")
     
@@ -582,10 +369,12 @@ def main():
         if st.button("🎯 Get Optimal Lineup", type="primary", use_container_width=True):
             with st.spinner("Running optimization..."):
                 try:
-                    selected, off_weight = get_optimal_lineup(
-                        team=home_team,
-                        goal_diff=goal_diff,
-                        player_minutes=st.session_state.player_minutes if st.session_state.player_minutes else None
+                    # Past ±MAX_GOAL_DIFF the weight is saturated (all offense or all
+                    # defense), so every larger differential shares one cached lineup
+                    selected, off_weight = get_cached_optimal_lineup(
+                        home_team,
+                        max(-MAX_GOAL_DIFF, min(MAX_GOAL_DIFF, goal_diff)),
+                        tuple(sorted(st.session_state.player_minutes.items()))
                     )
                     st.session_state.optimal_result = {
                         'selected': selected,
@@ -594,55 +383,45 @@ def main():
                 except Exception as e:
                     st.error(f"Optimization failed: {e}")
         
-        # Recommended Players
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="card-header">Recommended Players</div>', unsafe_allow_html=True)
+        # Recommended Players (one render for the whole card)
+        card_html = ['<div class="card-header">Recommended Players</div>']
         
         if st.session_state.optimal_result:
             result = st.session_state.optimal_result
             selected = result['selected']
             
             # Sort by classification descending
-            selected_sorted = selected.sort_values('mobility_rating', ascending=False)
+            order = np.argsort(-selected['mobility_rating'].to_numpy(), kind='stable')
             
-            for idx, (_, row) in enumerate(selected_sorted.iterrows(), 1):
-                minutes = st.session_state.player_minutes.get(row['player'], 0)
-                st.markdown(f"""
-                <div class="player-card">
-                    <div class="player-number">{idx}</div>
-                    <div class="player-info">
-                        <div class="player-name">{format_player_name(row['player'])}</div>
-                        <div class="player-stats">
-                            Class: {row['mobility_rating']} | O: {row['O_posterior']:.1f} | D: {row['D_posterior']:.1f} | Min: {minutes:.1f}
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            for idx, row in enumerate(selected.iloc[order].itertuples(index=False), 1):
+                minutes = st.session_state.player_minutes.get(row.player, 0)
+                card_html.append(
+                    '<div class="player-card">'
+                    f'<div class="player-number">{idx}</div>'
+                    '<div class="player-info">'
+                    f'<div class="player-name">{display_name(row.player)}</div>'
+                    '<div class="player-stats">'
+                    f'Class: {row.mobility_rating} | O: {row.O_posterior:.1f} | D: {row.D_posterior:.1f} | Min: {minutes:.1f}'
+                    '</div>'
+                    '</div>'
+                    '</div>'
+                )
             
             total_class = selected['mobility_rating'].sum()
             total_offense = selected['O_posterior'].sum()
             total_defense = selected['D_posterior'].sum()
             
-            st.markdown(f"""
-            <div class="stats-row">
-                <div>
-                    <div class="stat-label">Total Class</div>
-                    <div class="stat-value">{total_class:.1f}</div>
-                </div>
-                <div>
-                    <div class="stat-label">Offense</div>
-                    <div class="stat-value blue">{total_offense:.1f}</div>
-                </div>
-                <div>
-                    <div class="stat-label">Defense</div>
-                    <div class="stat-value green">{total_defense:.1f}</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            card_html.append(
+                '<div class="stats-row">'
+                f'<div><div class="stat-label">Total Class</div><div class="stat-value">{total_class:.1f}</div></div>'
+                f'<div><div class="stat-label">Offense</div><div class="stat-value blue">{total_offense:.1f}</div></div>'
+                f'<div><div class="stat-label">Defense</div><div class="stat-value green">{total_defense:.1f}</div></div>'
+                '</div>'
+            )
         else:
-            st.markdown('<div class="empty-state">Click "Get Optimal Lineup" to see recommendations</div>', unsafe_allow_html=True)
+            card_html.append('<div class="empty-state">Click "Get Optimal Lineup" to see recommendations</div>')
         
-        st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="card">{"".join(card_html)}</div>', unsafe_allow_html=True)
         
         # Model Explanation (minimal)
         with st.expander("📖 How the Model Works"):
@@ -0,0 +1,122 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, initializedcheck=False
+"""
+Compiled lineup search kernel (optional)
+
+Same branch-and-bound search as optimizer._best_lineup_bnb, compiled ahead of
+time so the app gets a fast kernel without Numba's import and JIT cost.
+optimizer.py uses it automatically once built:
+
+    python setup.py build_ext --inplace
+"""
+
+from libc.stdlib cimport malloc, free
+
+
+def best_lineup(
+    const float[::1] o,
+    const float[::1] d,
+    const float[::1] r,
+    float ow,
+    float dw,
+    float maxr
+):
+    """
+    Find the best 4-player lineup with total rating <= maxr.
+
+    Returns:
+    - (i, j, k, l) positions in ascending order, or (-1, -1, -1, -1) if no
+      lineup fits the rating limit
+    """
+    cdef Py_ssize_t n = o.shape[0]
+    cdef Py_ssize_t p, q, a, b, c, e, tmp
+    cdef Py_ssize_t ba = -1, bb = -1, bc = -1, be = -1
+    cdef Py_ssize_t sel[4]
+    cdef float best = 0.0
+    cdef float s, ra, rb, rc
+    cdef Py_ssize_t *order
+    cdef float *v
+    cdef float *w
+    cdef float *min_r
+
+    if n < 4:
+        return -1, -1, -1, -1
+
+    order = <Py_ssize_t *> malloc(n * sizeof(Py_ssize_t))
+    v = <float *> malloc(3 * n * sizeof(float))
+    if order == NULL or v == NULL:
+        free(order)
+        free(v)
+        raise MemoryError()
+    w = v + n
+    min_r = v + 2 * n
+
+    try:
+        with nogil:
+            # Insertion sort of players by descending marginal value
+            for p in range(n):
+                s = ow * o[p] - dw * d[p]
+                q = p
+                while q > 0 and v[q - 1] < s:
+                    v[q] = v[q - 1]
+                    order[q] = order[q - 1]
+                    q -= 1
+                v[q] = s
+                order[q] = p
+
+            # w = ratings in search order, min_r[p] = lowest of w[p:]
+            for p in range(n):
+                w[p] = r[order[p]]
+            min_r[n - 1] = w[n - 1]
+            for p in range(n - 2, -1, -1):
+                min_r[p] = min(w[p], min_r[p + 1])
+
+            for a in range(n - 3):
+                if ba >= 0 and v[a] + v[a + 1] + v[a + 2] + v[a + 3] <= best:
+                    break
+                ra = w[a]
+                if ra + 3 * min_r[a + 1] > maxr:
+                    continue
+                for b in range(a + 1, n - 2):
+                    if ba >= 0 and v[a] + v[b] + v[b + 1] + v[b + 2] <= best:
+                        break
+                    rb = ra + w[b]
+                    if rb + 2 * min_r[b + 1] > maxr:
+                        continue
+                    for c in range(b + 1, n - 1):
+                        if ba >= 0 and v[a] + v[b] + v[c] + v[c + 1] <= best:
+                            break
+                        rc = rb + w[c]
+                        if rc + min_r[c + 1] > maxr:
+                            continue
+                        for e in range(c + 1, n):
+                            if rc + w[e] > maxr:
+                                continue
+                            # First feasible e is the best completion of (a, b, c)
+                            s = v[a] + v[b] + v[c] + v[e]
+                            if ba < 0 or s > best:
+                                best = s
+                                ba = a
+                                bb = b
+                                bc = c
+                                be = e
+                            break
+
+            if ba >= 0:
+                sel[0] = order[ba]
+                sel[1] = order[bb]
+                sel[2] = order[bc]
+                sel[3] = order[be]
+                for p in range(1, 4):
+                    tmp = sel[p]
+                    q = p
+                    while q > 0 and sel[q - 1] > tmp:
+                        sel[q] = sel[q - 1]
+                        q -= 1
+                    sel[q] = tmp
+    finally:
+        free(order)
+        free(v)
+
+    if ba < 0:
+        return -1, -1, -1, -1
+    return sel[0], sel[1], sel[2], sel[3]
@@ -4,40 +4,132 @@ Wheelchair Rugby Lineup Optimizer
 This module contains functions for:
 - Calculating offensive/defensive weights based on game state
 - Applying fatigue penalties to player values
-- Optimizing lineups using Gurobi MILP
+- Optimizing lineups by exhaustive enumeration (or Gurobi MILP, opt-in)
 """
 
+import itertools
+import threading
 import pandas as pd
 import numpy as np
-import gurobipy as gp
-from gurobipy import GRB
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import NamedTuple
+
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+except ImportError:  # Gurobi is only needed for use_gurobi=True
+    gp = None
+    GRB = None
+
+try:
+    # Cython kernel, built with: python setup.py build_ext --inplace
+    from lineup_kernel import best_lineup as _best_lineup_c
+except ImportError:
+    _best_lineup_c = None
+
+numba = None
+if _best_lineup_c is None:
+    try:
+        import numba
+    except ImportError:  # Fall back to the NumPy enumerator
+        pass
 
 
 # Load pre-calculated player values
 DATA_DIR = Path(__file__).parent / "data"
 
+# Goal differential at which the strategy saturates at 100% offense/defense
+MAX_GOAL_DIFF = 20
+
+
+class TeamArrays(NamedTuple):
+    """
+    One team's players as contiguous arrays (structure of arrays).
+    
+    Values are float32: ratings are exact half-integers, ~7 significant
+    digits is plenty to rank four-term lineup sums, and it halves memory
+    traffic and doubles the SIMD width of the lineup search.
+    """
+    players: np.ndarray  # player ids
+    o: np.ndarray        # O_posterior
+    d: np.ndarray        # D_posterior
+    ratings: np.ndarray  # mobility_rating
 
+
+@lru_cache(maxsize=1)
 def load_player_values() -> pd.DataFrame:
-    """Load pre-calculated player values from CSV."""
+    """
+    Load pre-calculated player values from CSV.
+    
+    The CSV is static, so it is parsed once per process and the same
+    DataFrame is returned on every call. Treat it as read-only; copy before
+    adding or modifying columns.
+    """
     return pd.read_csv(DATA_DIR / "player_values.csv")
 
 
+@lru_cache(maxsize=1)
 def load_mobility_ratings() -> dict:
-    """Load mobility ratings as a dictionary."""
+    """Load mobility ratings as a dictionary (cached, treat as read-only)."""
     player_data = pd.read_csv(DATA_DIR / "player_data.csv")
     return dict(zip(player_data['player'], player_data['rating']))
 
 
-def get_teams() -> list[str]:
-    """Get list of all teams in the dataset."""
+@lru_cache(maxsize=1)
+def get_teams() -> tuple[str, ...]:
+    """Get all teams in the dataset, sorted by name (cached)."""
+    player_values = load_player_values()
+    return tuple(sorted(player_values['team'].unique().tolist()))
+
+
+@lru_cache(maxsize=1)
+def _team_tables() -> MappingProxyType:
+    """Split player values into one DataFrame per team (computed once)."""
     player_values = load_player_values()
-    return sorted(player_values['team'].unique().tolist())
+    return MappingProxyType(dict(tuple(player_values.groupby('team'))))
 
 
-def calculate_offensive_weight(goal_diff: int, max_diff: int = 20) -> float:
+def get_team_players(team: str) -> pd.DataFrame:
+    """Get all players for a team with their ratings (cached, treat as read-only)."""
+    team_players = _team_tables().get(team)
+    if team_players is None:
+        return load_player_values().iloc[:0]
+    return team_players
+
+
+def _to_team_arrays(team_players: pd.DataFrame) -> TeamArrays:
+    """Extract a team's optimizer inputs into contiguous arrays."""
+    return TeamArrays(
+        players=team_players['player'].to_numpy(),
+        o=np.ascontiguousarray(team_players['O_posterior'], dtype=np.float32),
+        d=np.ascontiguousarray(team_players['D_posterior'], dtype=np.float32),
+        ratings=np.ascontiguousarray(team_players['mobility_rating'], dtype=np.float32),
+    )
+
+
+@lru_cache(maxsize=1)
+def load_team_arrays() -> MappingProxyType:
+    """Per-team TeamArrays keyed by team (computed once, treat as read-only)."""
+    return MappingProxyType({
+        team: _to_team_arrays(team_players)
+        for team, team_players in _team_tables().items()
+    })
+
+
+def get_team_arrays(team: str) -> TeamArrays:
+    """Get a team's players as TeamArrays (row order matches get_team_players)."""
+    arrays = load_team_arrays().get(team)
+    if arrays is None:
+        return _to_team_arrays(get_team_players(team))
+    return arrays
+
+
+@lru_cache(maxsize=128)
+def calculate_offensive_weight(goal_diff: int, max_diff: int = MAX_GOAL_DIFF) -> float:
     """
-    Calculate offensive weight based on goal differential.
+    Calculate offensive weight based on goal differential (cached per input).
     
     Simple direct scaling - full range [0, 1]:
     - Losing by 20+ → 100% offensive (need to score!)
@@ -60,21 +152,28 @@ def calculate_offensive_weight(goal_diff: int, max_diff: int = 20) -> float:
     """
     # Normalize: flip sign so losing (negative) becomes positive
     normalized = -goal_diff / max_diff
-    normalized = max(-1, min(1, normalized))  # Clamp to [-1, 1]
-    
-    # Scale to [0, 1]: 0.5 is center, shift by up to 0.5
-    offensive_weight = 0.5 + (normalized * 0.5)
     
-    return offensive_weight
+    # Clamp to [-1, 1] and scale to [0, 1]: 0.5 is center, shift by up to 0.5
+    if normalized >= 1.0:
+        return 1.0
+    if normalized <= -1.0:
+        return 0.0
+    return 0.5 + (normalized * 0.5)
 
 
-def calculate_fatigue_penalty(minutes_played: float, fatigue_rate: float = 0.03, max_penalty: float = 0.30) -> float:
+def calculate_fatigue_penalty(
+    minutes_played: float | np.ndarray, 
+    fatigue_rate: float = 0.03, 
+    max_penalty: float = 0.30
+) -> float | np.ndarray:
     """
     Calculate fatigue multiplier based on minutes played.
     
+    Works elementwise on an array of minutes as well as on a single value.
+    
     Returns: float 0.7-1.0 (1.0 = fresh, 0.7 = max fatigue)
     """
-    penalty = min(fatigue_rate * minutes_played, max_penalty)
+    penalty = np.minimum(fatigue_rate * minutes_played, max_penalty)
     return 1.0 - penalty
 
 
@@ -95,10 +194,9 @@ def get_fatigue_adjusted_values(
     - DataFrame with fatigue-adjusted values
     """
     adjusted = player_values.copy()
-    adjusted['minutes_played'] = adjusted['player'].map(lambda p: player_minutes.get(p, 0))
-    adjusted['fatigue_mult'] = adjusted['minutes_played'].apply(
-        lambda m: calculate_fatigue_penalty(m, fatigue_rate)
-    )
+    minutes = adjusted['player'].map(player_minutes).fillna(0.0).to_numpy(dtype=np.float64)
+    adjusted['minutes_played'] = minutes
+    adjusted['fatigue_mult'] = calculate_fatigue_penalty(minutes, fatigue_rate)
     
     # Apply fatigue
     adjusted['O_fatigued'] = adjusted['O_posterior'] * adjusted['fatigue_mult']
@@ -108,6 +206,220 @@ def get_fatigue_adjusted_values(
     return adjusted
 
 
+def _lineup_arrays(team_players: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Extract (offense, defense, rating) arrays, using fatigued values if available."""
+    if 'O_fatigued' in team_players.columns:
+        o_vals = team_players['O_fatigued'].to_numpy(dtype=np.float32)
+        d_vals = team_players['D_fatigued'].to_numpy(dtype=np.float32)
+    else:
+        o_vals = team_players['O_posterior'].to_numpy(dtype=np.float32)
+        d_vals = team_players['D_posterior'].to_numpy(dtype=np.float32)
+    
+    ratings = team_players['mobility_rating'].to_numpy(dtype=np.float32)
+    return o_vals, d_vals, ratings
+
+
+@lru_cache(maxsize=None)
+def _combination_index(n: int) -> np.ndarray:
+    """All 4-player combinations of range(n) as a (C(n, 4), 4) index array."""
+    flat = itertools.chain.from_iterable(itertools.combinations(range(n), 4))
+    return np.fromiter(flat, dtype=np.intp).reshape(-1, 4)
+
+
+def _best_lineup_numpy(o, d, r, ow, dw, maxr):
+    """Score every 4-player combination in one vectorized NumPy pass."""
+    idx = _combination_index(len(o))
+    feasible = r[idx].sum(axis=1) <= maxr
+    if not feasible.any():
+        return -1, -1, -1, -1
+    
+    scores = np.where(feasible, (ow * o - dw * d)[idx].sum(axis=1), -np.inf)
+    return tuple(int(i) for i in idx[scores.argmax()])
+
+
+def _best_lineup_bnb(o, d, r, ow, dw, maxr):
+    """
+    Branch-and-bound search over lineups i < j < k < l.
+    
+    Players are visited in order of descending marginal value
+    (ow * o - dw * d), so the best completion of a partial lineup is the next
+    players in that order. A branch is cut when that optimistic completion
+    cannot beat the incumbent, or when even the lowest remaining ratings
+    would break the rating limit.
+    
+    Returns the indices of the best lineup with total rating <= maxr, or
+    (-1, -1, -1, -1) if there is none. Only fast when compiled with Numba.
+    """
+    n = o.shape[0]
+    marginal = ow * o - dw * d
+    order = np.argsort(-marginal)
+    v = marginal[order]
+    w = r[order]
+    
+    # min_r[p] = lowest rating among players p, p+1, ..., n-1
+    min_r = w.copy()
+    for p in range(n - 2, -1, -1):
+        min_r[p] = min(min_r[p], min_r[p + 1])
+    
+    best = np.float32(0.0)
+    ba = bb = bc = be = -1
+    for a in range(n - 3):
+        if ba >= 0 and v[a] + v[a + 1] + v[a + 2] + v[a + 3] <= best:
+            break
+        ra = w[a]
+        if ra + 3 * min_r[a + 1] > maxr:
+            continue
+        for b in range(a + 1, n - 2):
+            if ba >= 0 and v[a] + v[b] + v[b + 1] + v[b + 2] <= best:
+                break
+            rb = ra + w[b]
+            if rb + 2 * min_r[b + 1] > maxr:
+                continue
+            for c in range(b + 1, n - 1):
+                if ba >= 0 and v[a] + v[b] + v[c] + v[c + 1] <= best:
+                    break
+                rc = rb + w[c]
+                if rc + min_r[c + 1] > maxr:
+                    continue
+                for e in range(c + 1, n):
+                    if rc + w[e] > maxr:
+                        continue
+                    # First feasible e is the best completion of (a, b, c)
+                    s = v[a] + v[b] + v[c] + v[e]
+                    if ba < 0 or s > best:
+                        best = s
+                        ba, bb, bc, be = a, b, c, e
+                    break
+    
+    if ba < 0:
+        return -1, -1, -1, -1
+    
+    selected = np.array([order[ba], order[bb], order[bc], order[be]])
+    selected.sort()
+    return selected[0], selected[1], selected[2], selected[3]
+
+
+def _best_lineups_serial(o, d, r, weights, maxr):
+    """Run _best_lineup once per offensive weight; returns a (len(weights), 4) array."""
+    out = np.empty((len(weights), 4), dtype=np.int64)
+    for t, ow in enumerate(weights):
+        out[t] = _best_lineup(o, d, r, ow, np.float32(1.0) - ow, maxr)
+    return out
+
+
+if _best_lineup_c is not None:
+    _best_lineup = _best_lineup_c
+    _best_lineups = _best_lineups_serial
+elif numba is not None:
+    # Readonly arrays: pandas copy-on-write hands out non-writable buffers
+    _f4 = numba.types.float32
+    _f4_arr = numba.types.Array(_f4, 1, 'A', readonly=True)
+    _BEST_LINEUP_SIG = numba.types.UniTuple(numba.types.int64, 4)(
+        _f4_arr, _f4_arr, _f4_arr, _f4, _f4, _f4
+    )
+    _best_lineup_jit = numba.njit(cache=True, fastmath=True, nogil=True)(_best_lineup_bnb)
+    _best_lineup_ready = threading.Event()
+    
+    def _warm_up_best_lineup():
+        """Compile (or load from cache) the kernel, then pin it to that signature."""
+        try:
+            _best_lineup_jit.compile(_BEST_LINEUP_SIG)
+            _best_lineup_jit.disable_compile()  # Other arrays convert to this signature
+        finally:
+            _best_lineup_ready.set()
+    
+    def _best_lineup(o, d, r, ow, dw, maxr):
+        """Compiled _best_lineup_bnb; waits for the warm-up if it is still running."""
+        _best_lineup_ready.wait()
+        return _best_lineup_jit(o, d, r, ow, dw, maxr)
+    
+    # Compile off the import path so importing the app never blocks on LLVM
+    threading.Thread(target=_warm_up_best_lineup, name="best-lineup-warmup", daemon=True).start()
+    
+    @numba.njit(parallel=True, nogil=True, cache=True)
+    def _best_lineups_parallel(o, d, r, weights, maxr):
+        """Independent searches per offensive weight, spread across cores."""
+        out = np.empty((weights.shape[0], 4), dtype=np.int64)
+        for t in numba.prange(weights.shape[0]):
+            ow = weights[t]
+            bi, bj, bk, bl = _best_lineup_jit(o, d, r, ow, np.float32(1.0) - ow, maxr)
+            out[t, 0] = bi
+            out[t, 1] = bj
+            out[t, 2] = bk
+            out[t, 3] = bl
+        return out
+    
+    def _best_lineups(o, d, r, weights, maxr):
+        """Parallel _best_lineups_serial; waits for the kernel warm-up first."""
+        _best_lineup_ready.wait()
+        return _best_lineups_parallel(o, d, r, weights, maxr)
+else:
+    _best_lineup = _best_lineup_numpy
+    _best_lineups = _best_lineups_serial
+
+
+def optimize_lineup(
+    team_players: pd.DataFrame, 
+    offensive_weight: float = 0.5, 
+    max_rating: float = 8.0
+) -> pd.DataFrame:
+    """
+    Find optimal 4-player lineup by exact combinatorial search.
+    
+    A team only has ~12 players (a few hundred candidate lineups), so an
+    exact search is cheap and avoids the overhead of building and solving a
+    MILP. The search is a compiled branch-and-bound, using the Cython
+    lineup_kernel extension if built or Numba if installed; otherwise every
+    combination is scored in one vectorized NumPy pass.
+    
+    Parameters:
+    - team_players: DataFrame with player values for one team
+    - offensive_weight: 0-1, weight toward offense vs defense (0.5 = balanced)
+    - max_rating: Maximum total mobility rating (default 8.0)
+    
+    Returns:
+    - DataFrame with selected players
+    """
+    o_vals, d_vals, ratings = _lineup_arrays(team_players)
+    return team_players.iloc[_solve_lineup(o_vals, d_vals, ratings, offensive_weight, max_rating)]
+
+
+def _solve_lineup(
+    o_vals: np.ndarray, 
+    d_vals: np.ndarray, 
+    ratings: np.ndarray, 
+    offensive_weight: float, 
+    max_rating: float = 8.0
+) -> list[int]:
+    """Positions of the optimal lineup in the input arrays (see optimize_lineup)."""
+    # Objective: weighted offense - defense (lower defense is better)
+    defensive_weight = 1 - offensive_weight
+    best = _best_lineup(
+        np.ascontiguousarray(o_vals, dtype=np.float32),
+        np.ascontiguousarray(d_vals, dtype=np.float32),
+        np.ascontiguousarray(ratings, dtype=np.float32),
+        np.float32(offensive_weight), np.float32(defensive_weight), np.float32(max_rating)
+    )
+    if best[0] < 0:
+        raise ValueError(f"No 4-player lineup satisfies the rating limit of {max_rating}")
+    
+    return list(best)
+
+
+@lru_cache(maxsize=1)
+def _gurobi_env() -> "gp.Env":
+    """
+    Gurobi environment shared by all solves.
+    
+    Started on first use rather than at import, so the license check only
+    happens once and only when the Gurobi path is actually used.
+    """
+    env = gp.Env(empty=True)
+    env.setParam('OutputFlag', 0)  # Suppress solver output
+    env.start()
+    return env
+
+
 def optimize_lineup_gurobi(
     team_players: pd.DataFrame, 
     offensive_weight: float = 0.5, 
@@ -116,6 +428,9 @@ def optimize_lineup_gurobi(
     """
     Find optimal 4-player lineup using Gurobi MILP.
     
+    Same result as optimize_lineup(); kept for cross-checking and requires
+    gurobipy with a valid license.
+    
     Parameters:
     - team_players: DataFrame with player values for one team
     - offensive_weight: 0-1, weight toward offense vs defense (0.5 = balanced)
@@ -124,22 +439,16 @@ def optimize_lineup_gurobi(
     Returns:
     - DataFrame with selected players
     """
-    players = team_players['player'].tolist()
-    n = len(players)
+    if gp is None:
+        raise ImportError("gurobipy is required for optimize_lineup_gurobi")
     
-    # Get values (use fatigued if available, else posterior)
-    if 'O_fatigued' in team_players.columns:
-        o_vals = team_players['O_fatigued'].values
-        d_vals = team_players['D_fatigued'].values
-    else:
-        o_vals = team_players['O_posterior'].values
-        d_vals = team_players['D_posterior'].values
-    
-    ratings = team_players['mobility_rating'].values
+    n = len(team_players)
+    o_vals, d_vals, ratings = _lineup_arrays(team_players)
     
-    # Create Gurobi model
-    m = gp.Model("LineupOptimization")
-    m.setParam('OutputFlag', 0)  # Suppress solver output
+    # Create Gurobi model in the shared environment
+    m = gp.Model("LineupOptimization", env=_gurobi_env())
+    m.setParam('Presolve', 0)  # Tiny model: presolve costs more than it saves
+    m.setParam('Method', 0)  # Primal simplex for the LP relaxations
     
     # Decision variables: x[i] = 1 if player i is selected
     x = m.addVars(n, vtype=GRB.BINARY, name="select")
@@ -174,11 +483,26 @@ def optimize_lineup_gurobi(
         raise ValueError(f"Optimization failed with status {m.status}")
 
 
+def _fatigued_arrays(
+    arrays: TeamArrays, 
+    player_minutes: dict[str, float] | None, 
+    fatigue_rate: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Offense/defense arrays for a team, fatigue-adjusted if minutes are given."""
+    if not player_minutes:
+        return arrays.o, arrays.d
+    
+    minutes = np.array([player_minutes.get(p, 0.0) for p in arrays.players], dtype=np.float32)
+    fatigue_mult = calculate_fatigue_penalty(minutes, fatigue_rate)
+    return arrays.o * fatigue_mult, arrays.d / fatigue_mult  # Defense gets worse
+
+
 def get_optimal_lineup(
     team: str,
     goal_diff: int,
     player_minutes: dict[str, float] | None = None,
-    fatigue_rate: float = 0.03
+    fatigue_rate: float = 0.03,
+    use_gurobi: bool = False
 ) -> tuple[pd.DataFrame, float]:
     """
     Get optimal lineup for a team given current game state.
@@ -188,29 +512,80 @@ def get_optimal_lineup(
     - goal_diff: Current goal differential (positive = winning)
     - player_minutes: Dict mapping player -> minutes played this game
     - fatigue_rate: Rate of fatigue per minute
+    - use_gurobi: Solve with the Gurobi MILP instead of enumeration
     
     Returns:
     - (selected_players DataFrame, offensive_weight)
     """
-    # Load player values
-    player_values = load_player_values()
-    
-    # Filter to team
-    team_players = player_values[player_values['team'] == team].copy()
-    
-    # Apply fatigue if minutes provided
-    if player_minutes:
-        team_players = get_fatigue_adjusted_values(team_players, player_minutes, fatigue_rate)
+    team_players = get_team_players(team)
     
     # Calculate weights based on goal differential
     offensive_weight = calculate_offensive_weight(goal_diff)
     
-    # Optimize
-    selected = optimize_lineup_gurobi(team_players, offensive_weight)
+    if use_gurobi:
+        if player_minutes:
+            team_players = get_fatigue_adjusted_values(team_players, player_minutes, fatigue_rate)
+        return optimize_lineup_gurobi(team_players, offensive_weight), offensive_weight
+    
+    # Search on the team's contiguous arrays, applying fatigue if minutes provided
+    arrays = get_team_arrays(team)
+    o_vals, d_vals = _fatigued_arrays(arrays, player_minutes, fatigue_rate)
+    
+    # Optimize, then only build the DataFrame rows for the selected players
+    selected = team_players.iloc[_solve_lineup(o_vals, d_vals, arrays.ratings, offensive_weight)]
+    if player_minutes:
+        selected = get_fatigue_adjusted_values(selected, player_minutes, fatigue_rate)
     
     return selected, offensive_weight
 
 
+def get_lineup_policy(
+    team: str,
+    goal_diffs: list[int],
+    player_minutes: dict[str, float] | None = None,
+    fatigue_rate: float = 0.03
+) -> dict[int, pd.DataFrame]:
+    """
+    Get the optimal lineup for each of several goal differentials.
+    
+    Builds a policy table for one fatigue state: the searches for the
+    different goal differentials are independent and run in parallel when
+    Numba is installed.
+    
+    Parameters:
+    - team: Team name (e.g., 'Canada')
+    - goal_diffs: Goal differentials to solve for (positive = winning)
+    - player_minutes: Dict mapping player -> minutes played this game
+    - fatigue_rate: Rate of fatigue per minute
+    
+    Returns:
+    - Dict mapping goal_diff -> selected players DataFrame (as in get_optimal_lineup)
+    """
+    team_players = get_team_players(team)
+    arrays = get_team_arrays(team)
+    o_vals, d_vals = _fatigued_arrays(arrays, player_minutes, fatigue_rate)
+    
+    weights = np.array([calculate_offensive_weight(g) for g in goal_diffs], dtype=np.float32)
+    best = _best_lineups(
+        np.ascontiguousarray(o_vals, dtype=np.float32),
+        np.ascontiguousarray(d_vals, dtype=np.float32),
+        arrays.ratings,
+        weights,
+        np.float32(8.0)
+    )
+    if len(best) and best[:, 0].min() < 0:
+        raise ValueError("No 4-player lineup satisfies the rating limit of 8.0")
+    
+    policy = {}
+    for goal_diff, idx in zip(goal_diffs, best):
+        selected = team_players.iloc[idx]
+        if player_minutes:
+            selected = get_fatigue_adjusted_values(selected, player_minutes, fatigue_rate)
+        policy[goal_diff] = selected
+    
+    return policy
+
+
 def get_strategy_label(offensive_weight: float) -> str:
     """Get human-readable strategy label from offensive weight."""
     if offensive_weight >= 0.7:
@@ -0,0 +1,14 @@
+"""
+Build the optional compiled lineup kernel in place:
+
+    python setup.py build_ext --inplace
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+
+setup(
+    name="lineup-kernel",
+    ext_modules=cythonize("lineup_kernel.pyx"),
+)